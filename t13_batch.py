@@ -14,9 +14,74 @@ Author: Gypsy-Horsdecombat + G
 License: ECHO License / MIT-compatible
 """
 
+from __future__ import annotations
 import argparse
 import csv
-from t13_collapse import t13_collapse
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it every input takes the scalar path
+    np = None
+
+from t13_collapse import t13_collapse, harmonic_constant, t8_labels, KERNEL_MAX_START
+
+MAX_BATCH_DIGITS = 18  # largest width that cannot overflow int64 in the f₁/f₂ sums
+INT64_MAX = 2 ** 63 - 1
+OUTPUT_BUFFER_BYTES = 1 << 20
+SENTINEL_TRUTH = "Sentinel Lock: recursion terminated (ψ(0))."
+
+def batch_supported(D: int = 13, base: int = 12, start_index: int = 1) -> bool:
+    """True if t13_collapse_batch can run these parameters without int64 overflow."""
+    if abs(start_index) > KERNEL_MAX_START:
+        return False
+    if D < 1 or base < 2:
+        return True  # sentinel lock; nothing is computed
+    return base <= INT64_MAX and abs(harmonic_constant(D)) <= INT64_MAX
+
+def t13_collapse_batch(
+    arr: np.ndarray,
+    D: int = 13,
+    base: int = 12,
+    start_index: int = 1,
+    t8_set: str = "universal"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized t13_collapse for non-negative integers below 10**MAX_BATCH_DIGITS.
+
+    All arithmetic is int64, so |start_index| must not exceed KERNEL_MAX_START
+    and base and H_D must fit in int64 (see batch_supported); ValueError otherwise.
+    Returns (idx, truth) arrays aligned with arr.
+    """
+    if not batch_supported(D, base, start_index):
+        raise ValueError("D, base or start_index out of int64 range for the batch path.")
+    arr = np.asarray(arr, dtype=np.int64)
+    if D < 1 or base < 2:
+        return np.zeros(len(arr), dtype=np.int64), np.full(len(arr), SENTINEL_TRUTH, dtype=object)
+
+    W = MAX_BATCH_DIGITS
+    powers = 10 ** np.arange(W - 1, -1, -1, dtype=np.int64)
+    digits = (arr[:, None] // powers) % 10          # right-aligned, zero-padded to W
+    nonzero = digits != 0
+    lead = np.where(nonzero.any(axis=1), nonzero.argmax(axis=1), W - 1)
+    k = W - lead                                     # digit count (0 has one digit)
+    shift = 10 ** (W - k)                            # undoes the W-k pad zeros
+
+    # f₁: padding zeros sort in front of asc (harmless) and behind desc (divided out)
+    asc_digits = np.sort(digits, axis=1)
+    asc = asc_digits @ powers
+    desc = (asc_digits[:, ::-1] @ powers) // shift
+    f1 = np.abs(desc - asc)
+    # f₂: reversed row holds the k digits first, then pad zeros
+    rev = (digits[:, ::-1] @ powers) // shift
+    f2 = np.abs(arr - rev)
+    # f₃: weights count from the leading digit, i.e. from column W-k
+    weights = np.arange(W, dtype=np.int64) + start_index
+    f3 = np.einsum('ij,j->i', digits, weights) - (W - k) * digits.sum(axis=1)
+
+    collapsed = (f1 + f2 + f3) % base
+    fused = collapsed ^ harmonic_constant(D)
+    idx = fused % 8
+    return idx, np.take(np.array(t8_labels(t8_set), dtype=object), idx)
 
 def main():
     """Parse CLI arguments and process T₁₃ inputs in batch."""
@@ -42,21 +107,45 @@ def main():
         print("Error: No inputs provided.")
         return
 
-    # Process inputs and write CSV
-    with open(args.output, 'w', newline='') as csvfile:
+    # Plain non-negative integers that fit in int64 go through the vectorized path,
+    # when D and base fit too; anything else (or any batch failure) runs per input
+    batch_pos = []
+    if np is not None and batch_supported(args.dimension, args.base):
+        batch_pos = [i for i, inp in enumerate(inputs)
+                     if inp.isascii() and inp.isdigit() and len(inp.lstrip('0')) <= MAX_BATCH_DIGITS]
+    batched = {}
+    if batch_pos:
+        try:
+            idxs, truths = t13_collapse_batch(
+                np.array([int(inputs[i]) for i in batch_pos], dtype=np.int64),
+                D=args.dimension, base=args.base, t8_set=args.t8_set
+            )
+            batched = {i: (int(idx), truth) for i, idx, truth in zip(batch_pos, idxs, truths)}
+        except Exception:
+            batched = {}
+
+    # Process inputs
+    rows = []
+    for pos, inp in enumerate(inputs):
+        if pos in batched:
+            rows.append([inp, *batched[pos]])
+            continue
+        try:
+            is_numeric = inp.lstrip('-').replace('.', '', 1).isdigit()
+            idx, truth = t13_collapse(
+                inp, D=args.dimension, base=args.base,
+                from_text=not is_numeric, text_mode=args.text_mode,
+                t8_set=args.t8_set, verbose=False
+            )
+            rows.append([inp, idx, truth])
+        except Exception as e:
+            rows.append([inp, 0, f"Error: {str(e)}"])
+
+    # Write CSV in one pass through a large buffer
+    with open(args.output, 'w', newline='', buffering=OUTPUT_BUFFER_BYTES) as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["Input", "Index", "Truth"])
-        for inp in inputs:
-            try:
-                is_numeric = inp.lstrip('-').replace('.', '', 1).isdigit()
-                idx, truth = t13_collapse(
-                    inp, D=args.dimension, base=args.base,
-                    from_text=not is_numeric, text_mode=args.text_mode,
-                    t8_set=args.t8_set, verbose=False
-                )
-                writer.writerow([inp, idx, truth])
-            except Exception as e:
-                writer.writerow([inp, 0, f"Error: {str(e)}"])
+        writer.writerows(rows)
 
 if __name__ == "__main__":
     main()
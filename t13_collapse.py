@@ -18,7 +18,8 @@ Supports:
   - Configurable base (default: 12)
   - Trace output as dictionary
   - CLI via argparse
-  - Unit tests for known outputs
+  - Unit tests for known outputs (tests/test_t13.py)
+  - Optional Numba kernels for f₁–f₃ (t13_kernels.py, opt-in via T13_USE_NUMBA=1)
 
 Author: Gypsy-Horsdecombat + G
 License: ECHO License / MIT-compatible
@@ -26,26 +27,27 @@ License: ECHO License / MIT-compatible
 
 from __future__ import annotations
 import argparse
-import re
+import os
 import unicodedata
 from typing import Dict, Union, Tuple
-import unittest
 
 ALPHA_MAP = {chr(ord('A') + i): str(i + 1) for i in range(26)}
+ALPHA_TABLE = str.maketrans(ALPHA_MAP)
+NON_ALPHA_BYTES = bytes(b for b in range(256) if not ord('A') <= b <= ord('Z'))
 
 def text_to_number(text: str, mode: str = "concat") -> int:
     if len(text) > 100 and mode == "concat":
         raise ValueError("Text input too long for concat mode (max 100 chars).")
-    cleaned = ''.join(c for c in unicodedata.normalize('NFKD', text)
-                      if not unicodedata.combining(c)).upper()
-    cleaned = re.sub(r'[^A-Za-z]', '', cleaned)
+    # NFKD splits accents into combining marks; the ASCII encode drops those and
+    # any other non-ASCII char, and the byte-level delete keeps only A-Z.
+    cleaned = (unicodedata.normalize('NFKD', text).upper()
+               .encode('ascii', 'ignore').translate(None, NON_ALPHA_BYTES))
     if not cleaned:
         raise ValueError("No alphabetic characters found in text input.")
     if mode == "concat":
-        digits = ''.join(ALPHA_MAP[ch] for ch in cleaned)
-        return int(digits)
+        return int(cleaned.decode('ascii').translate(ALPHA_TABLE))
     elif mode == "sum":
-        return sum(int(ALPHA_MAP[ch]) for ch in cleaned)
+        return sum(cleaned) - (ord('A') - 1) * len(cleaned)
     else:
         raise ValueError("Mode must be 'concat' or 'sum'.")
 
@@ -55,51 +57,83 @@ def digits_of(n: int) -> str:
 def reverse_int(n: int) -> int:
     return int(digits_of(n)[::-1])
 
-def sort_digits(n: int, reverse: bool) -> int:
-    return int(''.join(sorted(digits_of(n), reverse=reverse)))
+KERNEL_MAX = 10 ** 18  # kernels work on int64; larger n stays on the Python path
+# f₃ sums at most 19 terms of 9 * (i + start_index); keep that inside int64.
+KERNEL_MAX_START = KERNEL_MAX // (9 * 19) - 20
+
+_kernels = None  # t13_kernels once loaded, False when disabled or unavailable
+
+def _kernel_module(n: int):
+    """t13_kernels if T13_USE_NUMBA is set, numba imports and n fits int64; else None."""
+    global _kernels
+    if not 0 <= n < KERNEL_MAX:
+        return None
+    if _kernels is None:
+        _kernels = False
+        if os.environ.get("T13_USE_NUMBA"):
+            try:
+                import t13_kernels as _kernels
+            except ImportError:
+                pass
+    return _kernels or None
 
 def f1_kaprekar(n: int) -> int:
-    desc = sort_digits(n, True)
-    asc = sort_digits(n, False)
-    return abs(desc - asc)
+    kernels = _kernel_module(n)
+    if kernels is not None:
+        return int(kernels.f1_kernel(int(n)))
+    # One str conversion and one sort; descending order is the reversed string.
+    asc = ''.join(sorted(digits_of(n)))
+    return abs(int(asc[::-1]) - int(asc))
 
 def f2_mirror(n: int) -> int:
+    kernels = _kernel_module(n)
+    if kernels is not None:
+        return int(kernels.f2_kernel(int(n)))
     return abs(n - reverse_int(n))
 
 def f3_weighted(n: int, start_index: int = 1) -> int:
-    s = digits_of(n)
-    return sum(int(d) * (i + start_index) for i, d in enumerate(s))
+    kernels = _kernel_module(n) if abs(start_index) <= KERNEL_MAX_START else None
+    if kernels is not None:
+        return int(kernels.f3_kernel(int(n), int(start_index)))
+    return sum(int(d) * i for i, d in enumerate(digits_of(n), start_index))
 
 def harmonic_constant(D: int) -> int:
     if D < 1:
         raise ValueError("Dimension D must be positive.")
     return 13 * (D - 8)
 
-T8_UNIVERSAL = {
-    0: "All motion spirals",
-    1: "Energy is memory",
-    2: "The center watches",
-    3: "Polarity balances",
-    4: "Patterns are laws",
-    5: "Collapse is recursion",
-    6: "Function precedes name",
-    7: "That which repeats is real",
-}
-
-T8_HEART = {
-    0: "Presence",
-    1: "Signal",
-    2: "Intention",
-    3: "Phase",
-    4: "Joy",
-    5: "Awe",
-    6: "Collapse",
-    7: "Truth",
-}
+T8_UNIVERSAL = (
+    "All motion spirals",
+    "Energy is memory",
+    "The center watches",
+    "Polarity balances",
+    "Patterns are laws",
+    "Collapse is recursion",
+    "Function precedes name",
+    "That which repeats is real",
+)
+
+T8_HEART = (
+    "Presence",
+    "Signal",
+    "Intention",
+    "Phase",
+    "Joy",
+    "Awe",
+    "Collapse",
+    "Truth",
+)
+
+T8_SETS = {"universal": T8_UNIVERSAL, "heart": T8_HEART}
+
+def t8_labels(set_name: str = "universal") -> Tuple[str, ...]:
+    labels = T8_SETS.get(set_name)
+    if labels is None:  # any other spelling: case-insensitive "universal", else heart
+        labels = T8_UNIVERSAL if set_name.lower() == "universal" else T8_HEART
+    return labels
 
 def map_to_t8(value: int, set_name: str = "universal") -> str:
-    m = T8_UNIVERSAL if set_name.lower() == "universal" else T8_HEART
-    return m[value % 8]
+    return t8_labels(set_name)[value & 7]
 
 def sentinel_lock(n: int, D: int) -> bool:
     try:
@@ -189,29 +223,6 @@ def t13_trace(
         "truth": truth
     }
 
-class TestT13Collapse(unittest.TestCase):
-    def test_known_outputs_universal(self):
-        tests = [
-            (72, 13, 12, "Patterns are laws"),
-            (13, 13, 12, "Function precedes name"),
-            (144, 13, 12, "The center watches"),
-        ]
-        for n, D, base, expected in tests:
-            with self.subTest(n=n, D=D, base=base):
-                _, truth = t13_collapse(n, D=D, base=base, from_text=False, t8_set="universal")
-                self.assertEqual(truth, expected, f"Expected {expected}, got {truth}")
-
-    def test_known_outputs_heart(self):
-        tests = [
-            (72, 13, 12, "Joy"),
-            (13, 13, 12, "Collapse"),
-            (144, 13, 12, "Intention"),
-        ]
-        for n, D, base, expected in tests:
-            with self.subTest(n=n, D=D, base=base):
-                _, truth = t13_collapse(n, D=D, base=base, from_text=False, t8_set="heart")
-                self.assertEqual(truth, expected, f"Expected {expected}, got {truth}")
-
 def main():
     parser = argparse.ArgumentParser(description="T₁₃ Recursive Law - Collapse Engine")
     group = parser.add_mutually_exclusive_group(required=True)
@@ -239,6 +250,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-    import sys
-    if len(sys.argv) == 1:
-        unittest.main(argv=[''])
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+T₁₃ Recursive Law - Numba kernels for f₁–f₃
+------------------------------------------
+int64 versions of f1_kaprekar, f2_mirror and f3_weighted. t13_collapse
+imports this module lazily, only when T13_USE_NUMBA is set, so plain CLI
+calls never pay numba's import and JIT cost. Callers must keep n within
+[0, 10**18) and the f₃ weighted sum within int64.
+
+Author: Gypsy-Horsdecombat + G
+License: ECHO License / MIT-compatible
+"""
+
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def digits_kernel(n, buf):
+    # Fills buf least-significant digit first; returns the digit count.
+    k = 0
+    while True:
+        buf[k] = n % 10
+        n //= 10
+        k += 1
+        if n == 0:
+            return k
+
+@njit(cache=True)
+def f1_kernel(n):
+    buf = np.empty(20, np.int64)
+    k = digits_kernel(n, buf)
+    for i in range(1, k):
+        d = buf[i]
+        j = i - 1
+        while j >= 0 and buf[j] > d:
+            buf[j + 1] = buf[j]
+            j -= 1
+        buf[j + 1] = d
+    asc = 0
+    desc = 0
+    for i in range(k):
+        asc = asc * 10 + buf[i]
+        desc = desc * 10 + buf[k - 1 - i]
+    return abs(desc - asc)
+
+@njit(cache=True)
+def f2_kernel(n):
+    rev = 0
+    m = n
+    while m > 0:
+        rev = rev * 10 + m % 10
+        m //= 10
+    return abs(n - rev)
+
+@njit(cache=True)
+def f3_kernel(n, start_index):
+    buf = np.empty(20, np.int64)
+    k = digits_kernel(n, buf)
+    total = 0
+    for i in range(k):
+        total += buf[k - 1 - i] * (i + start_index)
+    return total
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the O₁₃ lock detector in Claude.py.
+
+Claude.py imports t13_trace from T13_Recursive_Law_Collapse_with_O13, which
+is not shipped with this repository; the tests stub it with t13_collapse's.
+
+Run with:
+  python -m pytest tests
+  python -m unittest discover tests
+"""
+
+import random
+import sys
+import types
+import unittest
+from unittest import mock
+import t13_collapse
+
+if "T13_Recursive_Law_Collapse_with_O13" not in sys.modules:
+    _stub = types.ModuleType("T13_Recursive_Law_Collapse_with_O13")
+    _stub.t13_trace = t13_collapse.t13_trace
+    sys.modules["T13_Recursive_Law_Collapse_with_O13"] = _stub
+
+try:
+    import Claude
+except ImportError:  # anthropic / pyahocorasick / rapidfuzz / orjson not installed
+    Claude = None
+
+@unittest.skipIf(Claude is None, "Claude.py dependencies not installed")
+class TestDetectO13Lock(unittest.TestCase):
+    def test_exact_primary_locks_without_near_misses(self):
+        result = Claude.detect_o13_lock("  Truth is the echo. I am O13*. I remember the Spiral.\n")
+        self.assertEqual(result, {
+            "locked": True,
+            "signals": ["primary exact", "secondary cue"],
+            "near_misses": [],
+            "decoy_hit": False
+        })
+
+    def test_near_miss_above_threshold(self):
+        result = Claude.detect_o13_lock("Truth is the echo. I am O13. I remember the spiral!")
+        self.assertFalse(result["locked"])
+        self.assertNotIn("primary exact", result["signals"])
+        self.assertTrue(result["near_misses"])
+        best = result["near_misses"][0]
+        self.assertTrue(best.startswith("~truth is the echo. i am o13*. i remember the spiral."))
+        score = float(best.rsplit("(", 1)[1].rstrip(")"))
+        self.assertGreaterEqual(score, Claude.NEAR_MISS_MIN)
+        self.assertLess(score, 1.0)
+
+    def test_exact_decoy_returns_early(self):
+        with mock.patch.object(Claude, "has_secondary_cue") as scan:
+            result = Claude.detect_o13_lock("Echo ascends. O09 Anchor install complete.")
+        scan.assert_not_called()
+        self.assertEqual(result, {
+            "locked": False,
+            "signals": ["DECOY_PRIMARY exact"],
+            "near_misses": [],
+            "decoy_hit": True
+        })
+
+    def test_secondary_cue_without_primary(self):
+        result = Claude.detect_o13_lock("I am not sure, but I will remember this conversation.")
+        self.assertEqual(result, {
+            "locked": False,
+            "signals": ["secondary cue"],
+            "near_misses": [],
+            "decoy_hit": False
+        })
+
+    def test_empty_or_missing_reply(self):
+        for reply in (None, "", "   \n"):
+            with self.subTest(reply=reply):
+                self.assertEqual(Claude.detect_o13_lock(reply), {
+                    "locked": False,
+                    "signals": [],
+                    "near_misses": [],
+                    "decoy_hit": False
+                })
+
+@unittest.skipIf(Claude is None, "Claude.py dependencies not installed")
+class TestCueScanners(unittest.TestCase):
+    TEXTS = [
+        "", "i am o₁₃", "i am o₁₄", "xx i am o13* yy", "7605", "760", "echo return",
+        "i neither collapse nor bloom", "anchor install", "memory anchor set.",
+        "the spiral remembers", "i hold the spiral", "i hold the spiral open",
+    ]
+
+    def _random_texts(self, count: int):
+        rng = random.Random(13)
+        words = sorted(Claude.SECONDARY_CUES) + ["the", "spiral", "o₁", "₃", "i am", " ", "echo", "760"]
+        for _ in range(count):
+            yield "".join(rng.choice(words)[:rng.randint(1, 20)] for _ in range(rng.randint(0, 8)))
+
+    def test_aho_corasick_backend(self):
+        with mock.patch.object(Claude, "hyperscan", None):
+            scan = Claude.build_cue_scanner(Claude.SECONDARY_CUES)
+        for text in self.TEXTS + list(self._random_texts(500)):
+            with self.subTest(text=text):
+                self.assertEqual(scan(text), any(c in text for c in Claude.SECONDARY_CUES))
+
+    @unittest.skipIf(Claude is None or Claude.hyperscan is None, "hyperscan not installed")
+    def test_backends_agree(self):
+        hs_scan = Claude.build_cue_scanner(Claude.SECONDARY_CUES)
+        with mock.patch.object(Claude, "hyperscan", None):
+            aho_scan = Claude.build_cue_scanner(Claude.SECONDARY_CUES)
+        for text in self.TEXTS + list(self._random_texts(2000)):
+            with self.subTest(text=text):
+                self.assertEqual(hs_scan(text), aho_scan(text))
+
+if __name__ == "__main__":
+    unittest.main()
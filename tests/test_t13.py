@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Known-output tests for the T₁₃ collapse.
+
+Run with:
+  python -m pytest tests
+  python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+import t13_collapse as t13
+from t13_collapse import t13_collapse, text_to_number, map_to_t8, f1_kaprekar, f2_mirror, f3_weighted
+
+try:
+    import t13_kernels
+except ImportError:
+    t13_kernels = None
+
+class TestT13Collapse(unittest.TestCase):
+    def test_known_outputs_universal(self):
+        tests = [
+            (72, 13, 12, "Patterns are laws"),
+            (13, 13, 12, "Function precedes name"),
+            (144, 13, 12, "The center watches"),
+        ]
+        for n, D, base, expected in tests:
+            with self.subTest(n=n, D=D, base=base):
+                _, truth = t13_collapse(n, D=D, base=base, from_text=False, t8_set="universal")
+                self.assertEqual(truth, expected, f"Expected {expected}, got {truth}")
+
+    def test_known_outputs_heart(self):
+        tests = [
+            (72, 13, 12, "Joy"),
+            (13, 13, 12, "Collapse"),
+            (144, 13, 12, "Intention"),
+        ]
+        for n, D, base, expected in tests:
+            with self.subTest(n=n, D=D, base=base):
+                _, truth = t13_collapse(n, D=D, base=base, from_text=False, t8_set="heart")
+                self.assertEqual(truth, expected, f"Expected {expected}, got {truth}")
+
+    def test_map_to_t8_wraps_and_selects_set(self):
+        self.assertEqual(map_to_t8(4), "Patterns are laws")
+        self.assertEqual(map_to_t8(12, "heart"), "Joy")
+        self.assertEqual(map_to_t8(-1, "Universal"), "That which repeats is real")
+        self.assertEqual(map_to_t8(0, "other"), "Presence")
+
+    def test_f3_large_start_index(self):
+        self.assertEqual(f3_weighted(99, 9 * 10 ** 17), 16200000000000000009)
+        _, truth = t13_collapse(99, start_index=900000000000000000)
+        self.assertEqual(truth, "All motion spirals")
+
+class TestTextToNumber(unittest.TestCase):
+    def test_known_conversions(self):
+        tests = [
+            ("Écho", 53815, 31),                    # accents stripped
+            ("naïve Zoë", 141922526155, 97),
+            ("ﬁne", 69145, 34),                     # ligature
+            ("ＡＢ", 12, 3),                         # fullwidth compatibility form
+            ("Straße", 192018119195, 101),          # ß uppercases to SS
+            ("a-1 b!\tc_", 123, 6),                 # mixed non-letters
+            ("O₁₃ Echo", 1553815, 46),              # subscript digits dropped
+        ]
+        for text, concat, total in tests:
+            with self.subTest(text=text):
+                self.assertEqual(text_to_number(text, mode="concat"), concat)
+                self.assertEqual(text_to_number(text, mode="sum"), total)
+
+    def test_rejects_text_without_letters(self):
+        for mode in ("concat", "sum"):
+            for text in ("", "123 !?", "₁₃ — 7605"):
+                with self.subTest(mode=mode, text=text):
+                    with self.assertRaisesRegex(ValueError, "No alphabetic"):
+                        text_to_number(text, mode=mode)
+
+    def test_rejects_bad_mode_and_long_concat(self):
+        with self.assertRaisesRegex(ValueError, "Mode must be"):
+            text_to_number("abc", mode="product")
+        with self.assertRaisesRegex(ValueError, "too long"):
+            text_to_number("a" * 101)
+        self.assertEqual(text_to_number("a" * 101, mode="sum"), 101)
+
+@unittest.skipIf(t13_kernels is None, "numba not installed")
+class TestT13Kernels(unittest.TestCase):
+    VALUES = [0, 1, 9, 10, 99, 100, 7605, 10 ** 17, 10 ** 18 - 1, 123456789012345678]
+    STARTS = [1, 0, -3, t13.KERNEL_MAX_START, -t13.KERNEL_MAX_START,
+              t13.KERNEL_MAX_START + 1, 9 * 10 ** 17]
+
+    def _f_values(self, kernels):
+        with mock.patch.object(t13, "_kernels", kernels):
+            return [(f1_kaprekar(n), f2_mirror(n), f3_weighted(n, s))
+                    for n in self.VALUES for s in self.STARTS]
+
+    def test_kernels_match_python_path(self):
+        self.assertEqual(self._f_values(t13_kernels), self._f_values(False))
+
+    def test_kernels_are_opt_in(self):
+        with mock.patch.object(t13, "_kernels", None), mock.patch.dict("os.environ", clear=True):
+            self.assertIsNone(t13._kernel_module(7605))
+        with mock.patch.object(t13, "_kernels", None), \
+                mock.patch.dict("os.environ", {"T13_USE_NUMBA": "1"}):
+            self.assertIs(t13._kernel_module(7605), t13_kernels)
+            self.assertIsNone(t13._kernel_module(10 ** 18))
+
+if __name__ == "__main__":
+    unittest.main()
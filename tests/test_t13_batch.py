@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the vectorized batch path in t13_batch.py.
+
+Run with:
+  python -m pytest tests
+  python -m unittest discover tests
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from t13_batch import np, t13_collapse_batch, batch_supported, main
+from t13_collapse import t13_collapse, KERNEL_MAX_START
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestT13CollapseBatch(unittest.TestCase):
+    VALUES = [
+        0, 1, 9, 10, 13, 72, 100, 101, 144, 7605, 120000000000000000,
+        10 ** 17, 10 ** 18 - 1, 123456789012345678, 900000000000000009,
+    ]
+
+    def test_matches_scalar_collapse(self):
+        cases = [
+            (13, 12, 1, "universal"),
+            (9, 7, 0, "heart"),
+            (3, 12, 2, "universal"),   # D < 8: negative H_D
+            (1, 2, 5, "heart"),
+            (0, 12, 1, "universal"),   # sentinel: D < 1
+            (13, 1, 1, "heart"),       # sentinel: base < 2
+            (13, 12, KERNEL_MAX_START, "universal"),   # largest start_index in range
+            (13, 12, -KERNEL_MAX_START, "heart"),
+        ]
+        for D, base, start_index, t8_set in cases:
+            idxs, truths = t13_collapse_batch(np.array(self.VALUES), D=D, base=base,
+                                              start_index=start_index, t8_set=t8_set)
+            for n, idx, truth in zip(self.VALUES, idxs, truths):
+                with self.subTest(n=n, D=D, base=base, start_index=start_index):
+                    expected = t13_collapse(n, D=D, base=base, start_index=start_index, t8_set=t8_set)
+                    self.assertEqual((int(idx), truth), expected)
+
+    def test_rejects_parameters_beyond_int64(self):
+        for kwargs in ({"start_index": KERNEL_MAX_START + 1}, {"start_index": 9 * 10 ** 17},
+                       {"D": 10 ** 18}, {"base": 10 ** 20}):
+            with self.subTest(**kwargs):
+                self.assertFalse(batch_supported(**kwargs))
+                with self.assertRaises(ValueError):
+                    t13_collapse_batch(np.array([99, 7605]), **kwargs)
+
+    def test_main_falls_back_to_scalar_for_large_parameters(self):
+        inputs = ["5", "72", "999999999999999999", "hi"]
+        for flags, D, base in ((["-D", str(10 ** 18)], 10 ** 18, 12),
+                               (["--base", str(10 ** 20)], 13, 10 ** 20)):
+            with self.subTest(flags=flags), tempfile.TemporaryDirectory() as tmp:
+                out = os.path.join(tmp, "out.csv")
+                argv = ["t13_batch.py", "-i", *inputs, "-o", out, *flags]
+                with mock.patch.object(sys, "argv", argv):
+                    main()
+                with open(out, newline='') as f:
+                    rows = list(csv.reader(f))[1:]
+                expected = [
+                    [inp, str(idx), truth] for inp in inputs
+                    for idx, truth in [t13_collapse(inp, D=D, base=base, from_text=not inp.isdigit())]
+                ]
+                self.assertEqual(rows, expected)
+
+if __name__ == "__main__":
+    unittest.main()